@@ -0,0 +1,63 @@
+"""
+Compare parsing on the fetch threads, on a thread pool and on a process pool.
+
+The full main() flow runs against the local stand-in server of bench_suite.py once for every parse executor, so
+the only difference between the runs is where the html is parsed.
+
+Usage:
+    python benchmarks/bench_parse_executor.py [--fixtures DIR] [--parser NAME] [--pages N] [--workers N]
+        [--parse-workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import _fixtures_directory, load_corpus, start_server  # noqa: E402
+from investing import HttpFetcher, InvestingNewsExtractor, LxmlParser, SelectolaxParser, SoupParser  # noqa: E402
+
+_parsers = {
+    "bs4-html.parser": lambda: SoupParser("html.parser"),
+    "bs4-lxml": lambda: SoupParser("lxml"),
+    "lxml": LxmlParser,
+    "selectolax": SelectolaxParser,
+}
+
+
+def run(base_url: str, parser_name: str, parse_executor: str, pages: int, workers: int, parse_workers: int) -> dict:
+    extractor = InvestingNewsExtractor(fetcher=HttpFetcher(), base_url=base_url, workers=workers,
+                                       parser=_parsers[parser_name](), parse_executor=parse_executor,
+                                       parse_workers=parse_workers)
+    start = time.perf_counter()
+    news_count = len(extractor.main("eur-usd", pages))
+    elapsed = time.perf_counter() - start
+    extractor.close()
+    return {"seconds": elapsed, "articles": news_count, "articles_per_sec": news_count / elapsed}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--fixtures", default=_fixtures_directory)
+    arg_parser.add_argument("--parser", choices=sorted(_parsers), default="bs4-html.parser")
+    arg_parser.add_argument("--pages", type=int, default=10)
+    arg_parser.add_argument("--workers", type=int, default=8, help="fetch worker threads")
+    arg_parser.add_argument("--parse-workers", type=int, default=os.cpu_count())
+    args = arg_parser.parse_args()
+
+    listings, articles = load_corpus(args.fixtures)
+    server = start_server(listings, articles, 0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"parser: {args.parser}, fetch workers: {args.workers}, parse workers: {args.parse_workers}")
+    print(f"{'executor':<10}{'seconds':>10}{'articles/sec':>15}")
+    try:
+        for parse_executor in (None, "thread", "process"):
+            result = run(base_url, args.parser, parse_executor, args.pages, args.workers, args.parse_workers)
+            print(f"{parse_executor or 'inline':<10}{result['seconds']:>10.2f}{result['articles_per_sec']:>15.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
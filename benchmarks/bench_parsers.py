@@ -0,0 +1,110 @@
+"""
+Parse time of every installed parser backend for one news list page and one news page.
+
+Usage:
+    python benchmarks/bench_parsers.py [--listing FILE] [--article FILE] [--repeat N] [--next-data]
+
+Without html files synthetic pages are used, they have the same markers as investing.com pages and are padded with
+navigation, scripts and sidebars to a similar size. --next-data also embeds the news as a __NEXT_DATA__ json state
+blob, which the json-state parser reads without building a DOM.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from investing import (JsonStateParser, LxmlParser, SelectolaxParser, SoupParser, lxml_html,  # noqa: E402
+                       SelectolaxHTMLParser)
+
+
+def _page_chrome(blocks: int) -> str:
+    nav = "".join(f'<li class="nav-item"><a href="/markets/{i}">Market {i}</a></li>' for i in range(blocks))
+    script = "".join(f"<script>window.dataLayer.push({{'event': 'e{i}', 'value': {i}}});</script>"
+                     for i in range(blocks))
+    sidebar = "".join(f'<div class="sidebar-item"><span>Quote {i}</span><span>{i * 1.1:.4f}</span></div>'
+                      for i in range(blocks))
+    return f"<header><nav><ul>{nav}</ul></nav></header>{script}<aside>{sidebar}</aside>"
+
+
+def _next_data(page_props: dict) -> str:
+    return (f'<script id="__NEXT_DATA__" type="application/json">'
+            f'{json.dumps({"props": {"pageProps": page_props}, "page": "/news"})}</script>')
+
+
+def synthetic_listing_page(articles: int = 40, blocks: int = 400, next_data: bool = False) -> str:
+    state = _next_data({"news": [{"id": i, "title": f"Title of the news {i}",
+                                  "link": f"https://www.investing.com/news/forex-news/article-{i}",
+                                  "date": f"2024-05-01T12:{i % 60:02d}:00Z"}
+                                 for i in range(articles)]}) if next_data else ""
+    items = "".join(
+        f'<article data-test="article-item"><figure><img src="/img/{i}.jpg"></figure><div>'
+        f'<a data-test="article-title-link" href="/news/forex-news/article-{i}">Title of the news {i}</a>'
+        f'<p data-test="article-description">Short description of the news {i}</p>'
+        f'<time data-test="article-publish-date" datetime="2024-05-01 12:{i % 60:02d}:00">May 01</time>'
+        f'</div></article>'
+        for i in range(articles))
+    return (f"<html><head><title>News</title></head><body>{_page_chrome(blocks)}<ul>{items}</ul>{state}"
+            f"</body></html>")
+
+
+def synthetic_article_page(paragraphs: int = 15, blocks: int = 400, next_data: bool = False) -> str:
+    body = "".join(f"<p>Paragraph {i} of the news with <a href='/x'>a link</a> &amp; some more text.</p>"
+                   for i in range(paragraphs))
+    state = _next_data({"article": {"id": 1, "title": "Euro Climbs Against Dollar",
+                                    "body": body}}) if next_data else ""
+    return (f'<html><head><title>News</title></head><body>{_page_chrome(blocks)}'
+            f'<h1 id="articleTitle">Euro Climbs Against Dollar</h1><div id="article">{body}</div>{state}'
+            f'</body></html>')
+
+
+def available_parsers() -> list:
+    parsers = [SoupParser("html.parser", strained=False), SoupParser("html.parser")]
+    if lxml_html is not None:
+        parsers += [SoupParser("lxml", strained=False), SoupParser("lxml"), LxmlParser()]
+    if SelectolaxHTMLParser is not None:
+        parsers.append(SelectolaxParser())
+    parsers.append(JsonStateParser())
+    return parsers
+
+
+def measure(func, html_content: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html_content)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--listing", help="html file of a news list page")
+    arg_parser.add_argument("--article", help="html file of a news page")
+    arg_parser.add_argument("--repeat", type=int, default=50)
+    arg_parser.add_argument("--next-data", action="store_true", help="embed a __NEXT_DATA__ blob in synthetic pages")
+    args = arg_parser.parse_args()
+
+    listing = (open(args.listing, encoding="utf-8").read() if args.listing
+               else synthetic_listing_page(next_data=args.next_data))
+    article = (open(args.article, encoding="utf-8").read() if args.article
+               else synthetic_article_page(next_data=args.next_data))
+    print(f"listing page: {len(listing) / 1024:.0f} KiB, article page: {len(article) / 1024:.0f} KiB, "
+          f"repeat: {args.repeat}")
+
+    parsers = available_parsers()
+    reference = parsers[0]
+    print(f"{'parser':<22}{'listing ms':>12}{'article ms':>12}  same output")
+    for parser in parsers:
+        listing_ms = statistics.median(measure(parser.extract_links, listing, args.repeat)) * 1000
+        article_ms = statistics.median(measure(parser.extract_content, article, args.repeat)) * 1000
+        same = (parser.extract_links(listing) == reference.extract_links(listing)
+                and parser.extract_content(article) == reference.extract_content(article))
+        print(f"{parser.name:<22}{listing_ms:>12.2f}{article_ms:>12.2f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
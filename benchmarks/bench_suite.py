@@ -0,0 +1,197 @@
+"""
+Offline throughput benchmark of the extractor, no network is used.
+
+The parsers and the full main() flow run against a corpus of html fixtures. The full flow fetches the fixtures from
+a local stand-in http server with HttpFetcher, so fetching, parsing and building the news dicts are all measured.
+Reports pages/sec, articles/sec, p50/p99 latency and peak RSS.
+
+Usage:
+    python benchmarks/bench_suite.py [--fixtures DIR] [--pages N] [--symbols S ...] [--latency MS] [--json FILE]
+    python benchmarks/bench_suite.py --record-from ARCHIVE_DIR [--fixtures DIR]
+
+Fixtures are listing-*.html and article-*.html files in the fixtures directory (benchmarks/fixtures by default).
+--record-from copies the latest archived pages of a RawArchive into the fixtures directory. Without fixtures the
+synthetic pages of bench_parsers.py are used.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import resource
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parsers import synthetic_article_page, synthetic_listing_page  # noqa: E402
+from investing import HttpFetcher, InvestingNewsExtractor, RawArchive  # noqa: E402
+
+_fixtures_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_corpus(directory: str) -> tuple:
+    """
+        :return: (listing pages, article pages), synthetic pages when the directory has no fixtures
+    """
+    listings = [open(path, encoding="utf-8").read()
+                for path in sorted(glob.glob(os.path.join(directory, "listing-*.html")))]
+    articles = [open(path, encoding="utf-8").read()
+                for path in sorted(glob.glob(os.path.join(directory, "article-*.html")))]
+    if not listings:
+        listings = [synthetic_listing_page()]
+    if not articles:
+        articles = [synthetic_article_page()]
+    return listings, articles
+
+
+def record_from_archive(archive_directory: str, directory: str, limit: int = 20):
+    os.makedirs(directory, exist_ok=True)
+    archive = RawArchive(archive_directory)
+    for kind in ("listing", "article"):
+        latest: dict = {}
+        for url, html_content in archive.iter_pages(kind=kind):
+            latest[url] = html_content
+        for i, html_content in enumerate(list(latest.values())[-limit:]):
+            with open(os.path.join(directory, f"{kind}-{i:03d}.html"), "w", encoding="utf-8") as f:
+                f.write(html_content)
+        print(f"recorded {min(len(latest), limit)} {kind} pages")
+    archive.close()
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def _listing_href(match, prefix: str) -> str:
+    return f'href="/news/{prefix}/{match.group(1)}"'
+
+
+def start_server(listings: list, articles: list, latency: float) -> ThreadingHTTPServer:
+    """
+        serve the corpus like investing.com: news list pages on /currencies/{symbol}-news/{page}/ and news pages on
+        /news/... . the links of every news list page are made unique per symbol and page.
+    """
+    listing_path = re.compile(r"^/currencies/(?P<symbol>[^/]+)-news/(?P<page>\d+)/$")
+    news_href = re.compile(r'href="(?:https?://[^/"]+)?/news/([^"]*)"')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            match = listing_path.match(self.path)
+            if match:
+                page = int(match.group("page"))
+                prefix = f"{match.group('symbol')}/{page}"
+                body = news_href.sub(lambda m: _listing_href(m, prefix), listings[(page - 1) % len(listings)])
+            elif self.path.startswith("/news/"):
+                body = articles[zlib.crc32(self.path.encode("utf-8")) % len(articles)]
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TimedFetcher(HttpFetcher):
+    def __init__(self):
+        super().__init__()
+        self.timings: dict = {"listing": [], "article": []}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, kind: str = None) -> str:
+        start = time.perf_counter()
+        html_content = super().fetch(url, kind)
+        with self._lock:
+            self.timings.setdefault(kind, []).append(time.perf_counter() - start)
+        return html_content
+
+
+def bench_parsers(extractor: InvestingNewsExtractor, listings: list, articles: list, repeat: int) -> dict:
+    results = {}
+    for name, func, pages in (("parse_listing", extractor._extract_link_from_html, listings),
+                              ("parse_article", extractor._parser.extract_content, articles)):
+        timings = []
+        for _ in range(repeat):
+            for page in pages:
+                start = time.perf_counter()
+                func(page)
+                timings.append(time.perf_counter() - start)
+        results[name] = {"pages_per_sec": len(timings) / sum(timings),
+                         "p50_ms": percentile(timings, 50) * 1000, "p99_ms": percentile(timings, 99) * 1000}
+    return results
+
+
+def bench_main(base_url: str, symbols: list, pages: int, workers: int) -> dict:
+    fetcher = TimedFetcher()
+    extractor = InvestingNewsExtractor(fetcher=fetcher, base_url=base_url, workers=workers)
+    start = time.perf_counter()
+    news_count = sum(len(extractor.main(symbol, pages)) for symbol in symbols)
+    elapsed = time.perf_counter() - start
+    fetch_timings = fetcher.timings["listing"] + fetcher.timings["article"]
+    return {"seconds": elapsed, "pages_per_sec": len(fetcher.timings["listing"]) / elapsed,
+            "articles_per_sec": news_count / elapsed, "articles": news_count,
+            "fetch_p50_ms": percentile(fetch_timings, 50) * 1000,
+            "fetch_p99_ms": percentile(fetch_timings, 99) * 1000}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--fixtures", default=_fixtures_directory)
+    arg_parser.add_argument("--record-from", metavar="ARCHIVE_DIR")
+    arg_parser.add_argument("--pages", type=int, default=5, help="news list pages for every symbol")
+    arg_parser.add_argument("--symbols", nargs="+", default=["eur-usd", "gbp-usd"])
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--latency", type=float, default=0, help="simulated server latency in ms")
+    arg_parser.add_argument("--repeat", type=int, default=20, help="repeats of the parser benchmarks")
+    arg_parser.add_argument("--json", metavar="FILE", help="also write the results as json")
+    args = arg_parser.parse_args()
+
+    if args.record_from:
+        record_from_archive(args.record_from, args.fixtures)
+        return
+
+    listings, articles = load_corpus(args.fixtures)
+    server = start_server(listings, articles, args.latency / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results = bench_parsers(InvestingNewsExtractor(fetcher=HttpFetcher()), listings, articles, args.repeat)
+        results["main"] = bench_main(base_url, args.symbols, args.pages, args.workers)
+    finally:
+        server.shutdown()
+    # ru_maxrss is in KiB on linux
+    results["peak_rss_mib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"corpus: {len(listings)} listing pages, {len(articles)} article pages")
+    for name in ("parse_listing", "parse_article"):
+        r = results[name]
+        print(f"{name:<14} {r['pages_per_sec']:>9.1f} pages/sec  p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms")
+    r = results["main"]
+    print(f"{'main':<14} {r['pages_per_sec']:>9.1f} pages/sec  {r['articles_per_sec']:.1f} articles/sec  "
+          f"fetch p50 {r['fetch_p50_ms']:.2f} ms  p99 {r['fetch_p99_ms']:.2f} ms  ({r['articles']} articles in "
+          f"{r['seconds']:.2f} s)")
+    print(f"peak RSS {results['peak_rss_mib']:.1f} MiB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
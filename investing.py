@@ -1,106 +1,1841 @@
+import asyncio
 import datetime
+import hashlib
+import heapq
+import html
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
 
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver import Chrome, ChromeOptions
 from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
 import logging
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 logging.basicConfig(filename='investing_news_extractor.log', level=logging.INFO,
                     format='%(asctime)s:%(levelname)s:%(message)s')
 
 
-class InvestingNewsExtractor:
-    _base_url: str = "https://www.investing.com"
+class ExtractorError(Exception):
+    """
+        base class of the typed failures of the extractor, a failed page is recorded and skipped instead of
+        stopping the whole crawl
+    """
+
+    def __init__(self, url: str, message: str):
+        super().__init__(f"{message}: {url}")
+        self.url = url
+
+
+class FetchError(ExtractorError):
+    """
+        a page could not be fetched, `attempts` is the number of tries before giving up
+    """
+
+    def __init__(self, url: str, message: str, attempts: int = 1):
+        super().__init__(url, message)
+        self.attempts = attempts
+
+
+class HttpStatusError(FetchError):
+    """
+        the server answered with an error status, `retry_after` is the Retry-After header in seconds if it is given
+    """
+
+    def __init__(self, url: str, status: int, retry_after: float = None):
+        super().__init__(url, f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ParseError(ExtractorError):
+    """
+        a page was fetched but the expected content could not be found in it
+    """
+
+
+class PageUnchanged(Exception):
+    """
+        a news list page has the same news as the last time it was fetched, so it is not parsed again.
+        this is not a failure, it is only raised when the extractor revalidates news list pages
+    """
+
+    def __init__(self, url: str):
+        super().__init__(f"news list page is unchanged: {url}")
+        self.url = url
+
+
+class RetryPolicy:
+    """
+        retry a failed fetch up to `max_attempts` times with exponential backoff and full jitter.
+
+        timeouts, webdriver and connection errors, and http statuses in `retry_statuses` are retried, other errors
+        fail right away. a Retry-After header is respected when it asks for a longer wait than the backoff.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 jitter: bool = True,
+                 retry_on: tuple = (TimeoutException, WebDriverException, requests.ConnectionError, requests.Timeout),
+                 retry_statuses: tuple = (429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._retry_on = retry_on
+        self._retry_statuses = retry_statuses
+
+    def should_retry(self, error: Exception) -> bool:
+        if isinstance(error, HttpStatusError):
+            return error.status in self._retry_statuses
+        return isinstance(error, self._retry_on)
+
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        """
+            :param attempt: number of the failed attempt, starting from 1
+            :return: seconds to wait before the next attempt
+        """
+        delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        if self._jitter:
+            delay = random.uniform(0, delay)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._max_delay))
+        return delay
+
+
+class RateLimiter:
+    """
+        per host token bucket that is shared by every fetch of the extractor.
+
+        the rate of every host adapts AIMD style: it grows by `increase` requests/sec after every good response and
+        is multiplied by `decrease` after a throttled response (429, 5xx, captcha page) or a response slower than
+        `slow_threshold` seconds. failed requests without a response (connection errors, timeouts) do not grow it.
+        at most one decrease happens per `cooldown` seconds, so a burst of concurrent 429s only halves the rate once.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: float = 4, min_rate: float = 0.1, max_rate: float = 20.0,
+                 increase: float = 0.1, decrease: float = 0.5, slow_threshold: float = 5.0, cooldown: float = 2.0):
+        self._initial_rate = rate
+        self._burst = burst
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._slow_threshold = slow_threshold
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        # host -> [rate, tokens, last refill time, last decrease time]
+        self._buckets: dict = {}
+
+    def _bucket(self, host: str) -> list:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = [self._initial_rate, self._burst, time.monotonic(), 0.0]
+        return bucket
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(urlsplit(url).netloc)[0]
+
+    def acquire(self, url: str):
+        """
+            block until a request to the host of the url is allowed
+        """
+        host = urlsplit(url).netloc
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket[1] = min(self._burst, bucket[1] + (now - bucket[2]) * bucket[0])
+                bucket[2] = now
+                if bucket[1] >= 1:
+                    bucket[1] -= 1
+                    return
+                wait_time = (1 - bucket[1]) / bucket[0]
+            time.sleep(wait_time)
+
+    def record(self, url: str, latency: float, throttled: bool = False, failed: bool = False):
+        """
+            adapt the rate of the host of the url to the outcome of a request
+            :param failed: the request got no response, the rate is only lowered when it was slow
+        """
+        with self._lock:
+            bucket = self._bucket(urlsplit(url).netloc)
+            now = time.monotonic()
+            if throttled or latency > self._slow_threshold:
+                if now - bucket[3] >= self._cooldown:
+                    bucket[0] = max(self._min_rate, bucket[0] * self._decrease)
+                    bucket[1] = min(bucket[1], 0)
+                    bucket[3] = now
+                    logging.warning("Throttling %s down to %.2f requests/sec", urlsplit(url).netloc, bucket[0])
+            elif not failed:
+                bucket[0] = min(self._max_rate, bucket[0] + self._increase)
+
+
+class MetricsSink:
+    """
+        base class of the metrics sinks, the extractor reports stage timings and counters to a sink
+    """
+
+    def increment(self, name: str, value: int = 1, **labels):
+        pass
+
+    def observe(self, name: str, seconds: float, **labels):
+        pass
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+
+class MetricsRegistry(MetricsSink):
+    """
+        in-process metrics sink that keeps counters and the count/sum/max of every timer.
+        the metrics can be read with snapshot() or in prometheus text format with prometheus_text(), and
+        serve_prometheus() exposes them on a local http endpoint.
+    """
+
+    def __init__(self, prefix: str = "investing"):
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict = {}
+        self._timers: dict = {}
+
+    def increment(self, name: str, value: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            count, total, maximum = self._timers.get(key, (0, 0.0, 0.0))
+            self._timers[key] = (count + 1, total + seconds, max(maximum, seconds))
+
+    def snapshot(self) -> dict:
+        """
+            :return: {'counters': {(name, labels): value}, 'timers': {(name, labels): {'count', 'sum', 'max'}}}
+        """
+        with self._lock:
+            return {"counters": dict(self._counters),
+                    "timers": {key: {"count": count, "sum": total, "max": maximum}
+                               for key, (count, total, maximum) in self._timers.items()}}
 
-    def __init__(self):
-        self._driver: Chrome = None
-        self._news_url = "https://www.investing.com/currencies/{symbol}-news/{page_number}/"
+    @staticmethod
+    def _labels_text(labels: tuple) -> str:
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
 
-    def _setup_chrome(self):
+    def prometheus_text(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        for name in sorted({name for name, _ in snapshot["counters"]}):
+            metric = f"{self._prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (key_name, labels), value in sorted(snapshot["counters"].items()):
+                if key_name == name:
+                    lines.append(f"{metric}{self._labels_text(labels)} {value}")
+        for name in sorted({name for name, _ in snapshot["timers"]}):
+            metric = f"{self._prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for (key_name, labels), timer in sorted(snapshot["timers"].items()):
+                if key_name == name:
+                    lines.append(f"{metric}_count{self._labels_text(labels)} {timer['count']}")
+                    lines.append(f"{metric}_sum{self._labels_text(labels)} {timer['sum']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+            serve prometheus_text() on http://host:port/metrics from a daemon thread
+            :return: the server, call shutdown() on it to stop
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                data = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class Fetcher:
+    """
+        base class of the page fetchers, a fetcher get a url and return the html content of that page
+        :param kind: type of the page that is fetched ('listing' or 'article'), fetchers can use it as a hint
+    """
+    # fetchers that do not hit the network are not rate limited
+    rate_limited: bool = True
+
+    def fetch(self, url: str, kind: str = None) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpFetcher(Fetcher):
+    """
+        fetch pages with plain http requests over a pooled keep-alive session, this is much cheaper than a browser
+        :param conditional: revalidate news list pages with If-None-Match / If-Modified-Since, a 304 answer returns
+            the body of the last fetch without downloading it again
+    """
+    _headers: dict = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/124.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+    def __init__(self, timeout: float = 15, pool_size: int = 10, conditional: bool = False):
+        self._timeout = timeout
+        self._conditional = conditional
+        # url -> (etag, last_modified, body) of the last fetch of every news list page
+        self._validators: dict = {}
+        self._validators_lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def fetch(self, url: str, kind: str = None) -> str:
+        conditional = self._conditional and kind == "listing"
+        headers = {}
+        validators = None
+        if conditional:
+            with self._validators_lock:
+                validators = self._validators.get(url)
+            if validators is not None:
+                etag, last_modified, _ = validators
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+
+        response = self._session.get(url, timeout=self._timeout, headers=headers)
+        if response.status_code == 304 and validators is not None:
+            return validators[2]
+        if response.status_code >= 400:
+            retry_after = response.headers.get("Retry-After")
+            raise HttpStatusError(url, response.status_code,
+                                  float(retry_after) if retry_after and retry_after.isdigit() else None)
+
+        if conditional:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            with self._validators_lock:
+                if etag or last_modified:
+                    self._validators[url] = (etag, last_modified, response.text)
+                else:
+                    self._validators.pop(url, None)
+        return response.text
+
+    def close(self):
+        self._session.close()
+
+
+class ChromeProfile:
+    """
+        launch options of the chrome drivers of a DriverPool.
+
+        the default profile is a plain headless chrome. scraping() returns a profile tuned for scraping: the page
+        load strategy is eager (the fetcher waits for the news selectors instead of the full load event), images,
+        fonts, css and media are blocked, requests to known ad and tracker hosts are blocked, extensions and gpu
+        are disabled and the window is small.
+    """
+    # url patterns of the ad and tracker hosts that investing.com pages load, in devtools wildcard syntax
+    default_blocklist: tuple = (
+        "*doubleclick.net*", "*googlesyndication.com*", "*googletagservices.com*", "*googletagmanager.com*",
+        "*google-analytics.com*", "*adservice.google.*", "*amazon-adsystem.com*", "*adnxs.com*", "*criteo.com*",
+        "*criteo.net*", "*taboola.com*", "*outbrain.com*", "*rubiconproject.com*", "*pubmatic.com*", "*openx.net*",
+        "*casalemedia.com*", "*adsrvr.org*", "*bidswitch.net*", "*3lift.com*", "*sharethrough.com*", "*teads.tv*",
+        "*smartadserver.com*", "*moatads.com*", "*scorecardresearch.com*", "*quantserve.com*", "*hotjar.com*",
+        "*chartbeat.com*", "*connect.facebook.net*", "*ads-twitter.com*", "*analytics.twitter.com*",
+        "*bing.com/bat*", "*clarity.ms*", "*yieldmo.com*", "*media.net*",
+    )
+    _image_patterns: tuple = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif")
+    _font_patterns: tuple = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot")
+    _media_patterns: tuple = ("*.mp4", "*.webm", "*.mp3", "*.m3u8", "*.ogg")
+    _css_patterns: tuple = ("*.css",)
+
+    def __init__(self, headless: bool = True, page_load_strategy: str = "normal", block_images: bool = False,
+                 block_fonts: bool = False, block_css: bool = False, block_media: bool = False,
+                 disable_extensions: bool = False, disable_gpu: bool = False, window_size: tuple = None,
+                 page_load_timeout: float = None, wait_timeout: float = 10, arguments: tuple = (),
+                 blocklist: tuple = (), count_blocked: bool = False):
+        """
+        :param page_load_strategy: 'normal', 'eager' or 'none'. with 'eager' and 'none' ChromeFetcher waits until
+            the news selectors are present, at most wait_timeout seconds
+        :param arguments: extra chrome command line arguments
+        :param blocklist: url patterns that are blocked with the devtools protocol, e.g. default_blocklist
+        :param count_blocked: read the performance log after every page to count the blocked requests
+        """
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.block_css = block_css
+        self.block_media = block_media
+        self.disable_extensions = disable_extensions
+        self.disable_gpu = disable_gpu
+        self.window_size = window_size
+        self.page_load_timeout = page_load_timeout
+        self.wait_timeout = wait_timeout
+        self.arguments = tuple(arguments)
+        self.blocklist = tuple(blocklist)
+        self.count_blocked = count_blocked
+
+    @classmethod
+    def scraping(cls, **kwargs) -> "ChromeProfile":
+        options = dict(page_load_strategy="eager", block_images=True, block_fonts=True, block_css=True,
+                       block_media=True, disable_extensions=True, disable_gpu=True, window_size=(1024, 768),
+                       page_load_timeout=30, blocklist=cls.default_blocklist, count_blocked=True)
+        options.update(kwargs)
+        return cls(**options)
+
+    def blocked_url_patterns(self) -> list:
+        patterns = []
+        for block, block_patterns in ((self.block_images, self._image_patterns),
+                                      (self.block_fonts, self._font_patterns),
+                                      (self.block_css, self._css_patterns),
+                                      (self.block_media, self._media_patterns)):
+            if block:
+                patterns.extend(block_patterns)
+        patterns.extend(self.blocklist)
+        return patterns
+
+    def chrome_options(self) -> ChromeOptions:
         option = ChromeOptions()
-        option.add_argument("--headless")
-        self._driver = Chrome(options=option)
+        if self.headless:
+            option.add_argument("--headless")
+        option.page_load_strategy = self.page_load_strategy
+        if self.disable_extensions:
+            option.add_argument("--disable-extensions")
+        if self.disable_gpu:
+            option.add_argument("--disable-gpu")
+        if self.window_size:
+            option.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.block_images:
+            option.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        for argument in self.arguments:
+            option.add_argument(argument)
+        if self.count_blocked:
+            option.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return option
+
+    def apply(self, driver: Chrome):
+        """
+            apply the settings that need a running driver, the url blocking is done with the devtools protocol
+        """
+        if self.page_load_timeout:
+            driver.set_page_load_timeout(self.page_load_timeout)
+        patterns = self.blocked_url_patterns()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+class DriverPool:
+    """
+        keep up to `size` warm headless chrome drivers alive and hand them out to worker threads
+
+        a driver is recycled (quit and started again later) after `max_pages_per_driver` pages to contain chrome
+        memory growth, and every driver is health checked before it is handed out. a pool can be shared by many
+        extractors, so drivers stay warm across main() calls until close() is called.
+        :param profile: launch options of the drivers, default is a plain headless chrome
+    """
+
+    def __init__(self, size: int = 2, max_pages_per_driver: int = 100, profile: ChromeProfile = None):
+        self.profile: ChromeProfile = profile or ChromeProfile()
+        self._size = size
+        self._max_pages_per_driver = max_pages_per_driver
+        # idle drivers, and None wake-ups for the waiting threads when a discarded driver frees a slot
+        self._idle: queue.Queue = queue.Queue()
+        self._page_counts: dict = {}
+        self._started = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _setup_chrome(self) -> Chrome:
+        driver = Chrome(options=self.profile.chrome_options())
+        try:
+            self.profile.apply(driver)
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    @staticmethod
+    def _is_healthy(driver: Chrome) -> bool:
+        try:
+            # any command needs a round trip to the browser, a dead browser raises here
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _start_driver(self) -> Chrome:
+        driver = self._setup_chrome()
+        with self._lock:
+            self._page_counts[driver] = (self._generation, 0)
+        return driver
+
+    def _discard(self, driver: Chrome):
+        with self._lock:
+            self._page_counts.pop(driver, None)
+            self._started -= 1
+        # a thread that waits for an idle driver can start a new one in the freed slot
+        self._idle.put(None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning("Could not quit chrome driver: %s", e)
+
+    def warm_up(self):
+        """
+            start all the drivers of the pool now instead of on the first fetches
+        """
+        drivers = []
+        while True:
+            with self._lock:
+                if self._started >= self._size:
+                    break
+                self._started += 1
+            try:
+                drivers.append(self._start_driver())
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+        for driver in drivers:
+            self._idle.put(driver)
+
+    def acquire(self, timeout: float = None) -> Chrome:
+        """
+            get a healthy driver, a new one is started when the pool is not full, otherwise wait for a free one
+            :raise queue.Empty: if no driver is free within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_start = self._started < self._size
+                    if can_start:
+                        self._started += 1
+                if can_start:
+                    try:
+                        return self._start_driver()
+                    except Exception:
+                        with self._lock:
+                            self._started -= 1
+                        raise
+                driver = self._idle.get(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+            if driver is None:
+                continue
+            if self._is_healthy(driver):
+                return driver
+            logging.warning("Discarding unhealthy chrome driver")
+            self._discard(driver)
+
+    def release(self, driver: Chrome):
+        with self._lock:
+            generation, pages = self._page_counts.get(driver, (None, 0))
+            pages += 1
+            recycle = generation != self._generation or pages >= self._max_pages_per_driver
+            if not recycle:
+                self._page_counts[driver] = (generation, pages)
+        if recycle:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout: float = None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """
+            quit all idle drivers, drivers that are in use are quit when they are released.
+            the pool can still be used after close, new drivers are started on demand.
+        """
+        with self._lock:
+            self._generation += 1
+        drivers = []
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                drivers.append(driver)
+        for driver in drivers:
+            self._discard(driver)
+
+
+class ChromeFetcher(Fetcher):
+    """
+        fetch pages with headless chrome drivers from a DriverPool, the drivers are started on the first fetch
+        :param pool: a shared pool, it is not closed with the fetcher. by default the fetcher owns a one driver pool
+        :param metrics: sink of the navigation and page_source timings
+        :param profile: launch options of the owned pool, ignored when a pool is given
+    """
+    # elements that must be present before the page source is read, when the page load strategy is not 'normal'
+    _wait_selectors: dict = {"listing": 'article[data-test="article-item"]', "article": "#articleTitle"}
 
-    def _get_site_html_content(self, url) -> str:
+    def __init__(self, pool: DriverPool = None, metrics: MetricsSink = None, profile: ChromeProfile = None):
+        self._owns_pool = pool is None
+        self._pool: DriverPool = pool or DriverPool(size=1, profile=profile)
+        self._metrics: MetricsSink = metrics or MetricsSink()
+
+    def _wait_for_page(self, driver: Chrome, kind: str = None):
+        selector = self._wait_selectors.get(kind)
+        if selector is None or self._pool.profile.page_load_strategy == "normal":
+            return
         try:
-            self._driver.get(url)
-            return self._driver.page_source
+            WebDriverWait(driver, self._pool.profile.wait_timeout).until(
+                expected_conditions.presence_of_element_located((By.CSS_SELECTOR, selector)))
         except TimeoutException:
-            logging.error("Timeout while trying to load the page: %s", url)
-            return "Error: Timeout while trying to load the page."
+            # the page is returned anyway, a page without markers is handled by the extractor
+            logging.warning("Timeout while waiting for %s on: %s", selector, driver.current_url)
+
+    def _count_blocked_requests(self, driver: Chrome, kind: str = None):
+        # reading the performance log also drains it, so it does not grow while the driver is alive
+        blocked = 0
+        try:
+            entries = driver.get_log("performance")
         except WebDriverException as e:
-            logging.error("WebDriver exception occurred: %s", str(e))
-            return f"Error: WebDriver exception occurred: {str(e)}"
-        except Exception as e:
-            logging.error("An unexpected error occurred: %s", str(e))
-            return f"Error: An unexpected error occurred: {str(e)}"
+            logging.warning("Could not read the performance log: %s", e)
+            return
+        for entry in entries:
+            message = entry.get("message", "")
+            if '"Network.loadingFailed"' not in message or "blockedReason" not in message:
+                continue
+            if json.loads(message)["message"].get("params", {}).get("blockedReason"):
+                blocked += 1
+        if blocked:
+            self._metrics.increment("chrome_blocked_requests", blocked, kind=kind)
+
+    def fetch(self, url: str, kind: str = None) -> str:
+        with self._pool.driver() as driver:
+            with self._metrics.timer("chrome_navigation", kind=kind):
+                driver.get(url)
+                self._wait_for_page(driver, kind)
+            with self._metrics.timer("chrome_page_source", kind=kind):
+                html_content = driver.page_source
+            if self._pool.profile.count_blocked:
+                self._count_blocked_requests(driver, kind)
+            return html_content
+
+    def close(self):
+        if self._owns_pool:
+            self._pool.close()
+
 
-    def _extract_link_from_html(self, html_content: str):
+class NewsParser:
+    """
+        base class of the html parsers, every parser returns the same output for the same page
+    """
+    name: str = None
+
+    def extract_links(self, html_content: str) -> list:
         """
-            this function get a html page and extract all the news link
             :param html_content: html content of the news lists page
-            :return: a list of news links
+            :return: a list of {'url', 'timestamp'} dicts
         """
+        raise NotImplementedError
+
+    def extract_content(self, html_content: str):
+        """
+            :param html_content: html content of a news page
+            :return: a {'content', 'title'} dict, or None if the content cannot be found
+        """
+        raise NotImplementedError
+
+
+def _is_article_part(name: str, attrs: dict) -> bool:
+    return (name == 'div' and attrs.get('id') == 'article') or (name == 'h1' and attrs.get('id') == 'articleTitle')
+
+
+class SoupParser(NewsParser):
+    """
+        parse with BeautifulSoup, `features` is the tree builder ('html.parser' or 'lxml').
+
+        when `strained` is True only the needed subtrees are built (the news items of a news list page, the article
+        div and title of a news page), so the cost of a page scales with its news and not with the page chrome.
+    """
+    _listing_strainer = SoupStrainer('article', attrs={'data-test': 'article-item'})
+    _article_strainer = SoupStrainer(_is_article_part)
+
+    def __init__(self, features: str = "html.parser", strained: bool = True):
+        self._features = features
+        self._strained = strained
+        self.name = f"bs4-{features}" if strained else f"bs4-{features}-full"
+
+    def extract_links(self, html_content: str) -> list:
+        soup = BeautifulSoup(html_content, self._features,
+                             parse_only=self._listing_strainer if self._strained else None)
+
+        news_data = []
+        for article in soup.find_all('article', {'data-test': 'article-item'}):
+            # Extract URL
+            link_tag = article.find('a', {'data-test': 'article-title-link'})
+            url = link_tag.get('href') if link_tag else None
+
+            # Extract timestamp
+            time_tag = article.find('time', {'data-test': 'article-publish-date'})
+            timestamp = time_tag.get('datetime') if time_tag else None
+
+            # Save the extracted data
+            if url and timestamp:
+                news_data.append({'url': url, 'timestamp': timestamp})
+
+        return news_data
+
+    def extract_content(self, html_content: str):
+        soup = BeautifulSoup(html_content, self._features,
+                             parse_only=self._article_strainer if self._strained else None)
+
+        # Find the <div> element with the id "article" that typically contains the news content.
+        article_div = soup.find('div', id='article')
+        title_tag = soup.find("h1", id='articleTitle')
+        if not article_div or not title_tag:
+            return None
+
+        # Extract the text content of all the <p> tags within the div, one line for each.
+        text = ""
+        for p in article_div.find_all('p'):
+            text += p.get_text()
+            text += "\n"
+
+        return {"content": text, "title": title_tag.get_text()}
+
+
+class LxmlParser(NewsParser):
+    """
+        parse directly with lxml, without building a BeautifulSoup tree
+    """
+    name = "lxml"
+
+    def extract_links(self, html_content: str) -> list:
+        tree = lxml_html.fromstring(html_content)
+
+        news_data = []
+        for article in tree.iterfind('.//article[@data-test="article-item"]'):
+            link_tag = article.find('.//a[@data-test="article-title-link"]')
+            url = link_tag.get('href') if link_tag is not None else None
+
+            time_tag = article.find('.//time[@data-test="article-publish-date"]')
+            timestamp = time_tag.get('datetime') if time_tag is not None else None
+
+            if url and timestamp:
+                news_data.append({'url': url, 'timestamp': timestamp})
+
+        return news_data
+
+    def extract_content(self, html_content: str):
+        tree = lxml_html.fromstring(html_content)
+
+        article_div = tree.find('.//div[@id="article"]')
+        title_tag = tree.find('.//h1[@id="articleTitle"]')
+        if article_div is None or title_tag is None:
+            return None
+
+        text = ""
+        for p in article_div.iterfind('.//p'):
+            text += p.text_content()
+            text += "\n"
+
+        return {"content": text, "title": title_tag.text_content()}
+
+
+class SelectolaxParser(NewsParser):
+    """
+        parse with selectolax (lexbor engine), the fastest parser when it is installed
+    """
+    name = "selectolax"
+
+    def extract_links(self, html_content: str) -> list:
+        tree = SelectolaxHTMLParser(html_content)
+
+        news_data = []
+        for article in tree.css('article[data-test="article-item"]'):
+            link_tag = article.css_first('a[data-test="article-title-link"]')
+            url = link_tag.attributes.get('href') if link_tag is not None else None
+
+            time_tag = article.css_first('time[data-test="article-publish-date"]')
+            timestamp = time_tag.attributes.get('datetime') if time_tag is not None else None
+
+            if url and timestamp:
+                news_data.append({'url': url, 'timestamp': timestamp})
+
+        return news_data
 
+    def extract_content(self, html_content: str):
+        tree = SelectolaxHTMLParser(html_content)
+
+        article_div = tree.css_first('div#article')
+        title_tag = tree.css_first('h1#articleTitle')
+        if article_div is None or title_tag is None:
+            return None
+
+        text = ""
+        for p in article_div.css('p'):
+            text += p.text(deep=True)
+            text += "\n"
+
+        return {"content": text, "title": title_tag.text(deep=True)}
+
+
+class JsonStateParser(NewsParser):
+    """
+        read the news from the json state blob that the page embeds for its javascript (__NEXT_DATA__), without
+        building a DOM. pages without the blob, or whose blob has no news, are parsed by the `fallback` DOM parser.
+        it is opt-in (parser=JsonStateParser()), the layout of the blob is not documented by investing.com.
+
+        the news list is the list at `list_path` (e.g. ('props', 'pageProps', 'news')), or else the longest list of
+        objects with a /news/ link that is not under a sidebar key (popular, related, ...). items without a link or a
+        date are skipped like the DOM parsers skip them. when the page also has news items in its html and their
+        count differs from the list, the list is not trusted and the page goes to the fallback parser.
+        a news page is the object with a title and an html body. the output is normalized to the DOM parsers.
+    """
+    name = "json-state"
+    _blob_start = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>')
+    _paragraph = re.compile(r"<p\b[^>]*>(.*?)</p\s*>", re.S | re.I)
+    _tag = re.compile(r"<[^>]+>")
+    _url_keys: tuple = ("link", "href", "url")
+    _date_keys: tuple = ("date", "datetime", "publishedAt", "published_at", "publishDate", "time")
+    _body_keys: tuple = ("body", "content", "articleBody")
+    _title_keys: tuple = ("title", "headline")
+    # lists under these keys are side lists of the page, not its news list
+    _sidebar_keys: tuple = ("popular", "related", "trending", "recommended", "sidebar", "editorspick")
+    _item_marker = 'data-test="article-item"'
+
+    def __init__(self, fallback: NewsParser = None, list_path: tuple = None):
+        self._fallback: NewsParser = fallback or default_dom_parser()
+        self._list_path = tuple(list_path) if list_path is not None else None
+        self.name = f"json-state+{self._fallback.name}"
+
+    def _load_state(self, html_content: str):
+        match = self._blob_start.search(html_content)
+        if match is None:
+            return None
+        end = html_content.find("</script>", match.end())
+        if end == -1:
+            return None
+        blob = html_content[match.end():end]
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
+            return orjson.loads(blob) if orjson is not None else json.loads(blob)
+        except ValueError:
+            return None
 
-            news_data = []
-            for article in soup.find_all('article', {'data-test': 'article-item'}):
-                # Extract URL
-                link_tag = article.find('a', {'data-test': 'article-title-link'})
-                url = link_tag['href'] if link_tag else None
+    @staticmethod
+    def _walk(node):
+        """
+            :return: a generator of (path, node) of every dict and list in the state, path is the tuple of dict keys
+        """
+        stack = [((), node)]
+        while stack:
+            path, node = stack.pop()
+            if isinstance(node, dict):
+                yield path, node
+                stack.extend(reversed([(path + (key,), value) for key, value in node.items()]))
+            elif isinstance(node, list):
+                yield path, node
+                stack.extend(reversed([(path, value) for value in node]))
 
-                # Extract timestamp
-                time_tag = article.find('time', {'data-test': 'article-publish-date'})
-                timestamp = time_tag['datetime'] if time_tag else None
+    @staticmethod
+    def _first(item: dict, keys: tuple):
+        for key in keys:
+            value = item.get(key)
+            if value:
+                return value
+        return None
 
-                # Save the extracted data
-                if url and timestamp:
-                    news_data.append({'url': url, 'timestamp': timestamp})
+    @staticmethod
+    def _normalize_timestamp(value):
+        # the DOM parsers return "%Y-%m-%d %H:%M:%S", the blob has iso strings or epoch numbers
+        try:
+            if isinstance(value, (int, float)):
+                moment = datetime.datetime.fromtimestamp(value / 1000 if value > 1e11 else value,
+                                                         datetime.timezone.utc)
+            else:
+                moment = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            return moment.strftime("%Y-%m-%d %H:%M:%S")
+        except (ValueError, OverflowError, OSError):
+            return None
 
-            return news_data
-        except Exception as e:
-            logging.error("An unexpected error occurred: %s", str(e))
-            return f"Error: An unexpected error occurred: {str(e)}"
+    def _news_url(self, item):
+        if not isinstance(item, dict):
+            return None
+        url = self._first(item, self._url_keys)
+        return url if isinstance(url, str) and "/news/" in url else None
+
+    def _news_link(self, item):
+        url = self._news_url(item)
+        date = self._first(item, self._date_keys) if url is not None else None
+        if date is None:
+            return None
+        timestamp = self._normalize_timestamp(date)
+        if timestamp is None:
+            return None
+        return {'url': urlsplit(url).path if url.startswith("http") else url, 'timestamp': timestamp}
+
+    def _is_sidebar_path(self, path: tuple) -> bool:
+        keys = [str(key).lower() for key in path]
+        return any(sidebar_key in key for key in keys for sidebar_key in self._sidebar_keys)
+
+    def _find_news_list(self, state):
+        """
+            :return: the items of the news list of the state that have a /news/ link, None when there is none
+        """
+        news_items = None
+        for path, node in self._walk(state):
+            if not isinstance(node, list):
+                continue
+            if self._list_path is not None:
+                if path != self._list_path:
+                    continue
+            elif self._is_sidebar_path(path):
+                continue
+            items = [item for item in node if self._news_url(item) is not None]
+            if items and (news_items is None or len(items) > len(news_items)):
+                news_items = items
+        return news_items
+
+    def extract_links(self, html_content: str) -> list:
+        state = self._load_state(html_content)
+        news_items = self._find_news_list(state) if state is not None else None
+        if not news_items:
+            return self._fallback.extract_links(html_content)
+        expected = html_content.count(self._item_marker)
+        if expected and expected != len(news_items):
+            logging.warning("News list of the json state has %s items but the page has %s, using %s",
+                            len(news_items), expected, self._fallback.name)
+            return self._fallback.extract_links(html_content)
+        return [link for link in (self._news_link(item) for item in news_items) if link is not None]
+
+    def extract_content(self, html_content: str):
+        state = self._load_state(html_content)
+        if state is not None:
+            for _, node in self._walk(state):
+                if not isinstance(node, dict):
+                    continue
+                title = self._first(node, self._title_keys)
+                body = self._first(node, self._body_keys)
+                if isinstance(title, str) and isinstance(body, str) and "<p" in body:
+                    text = ""
+                    for paragraph in self._paragraph.findall(body):
+                        text += html.unescape(self._tag.sub("", paragraph))
+                        text += "\n"
+                    return {"content": text, "title": title}
+        return self._fallback.extract_content(html_content)
+
+
+def default_dom_parser() -> NewsParser:
+    """
+        the fastest DOM parser that is installed: selectolax, then lxml, then BeautifulSoup with html.parser
+    """
+    if SelectolaxHTMLParser is not None:
+        return SelectolaxParser()
+    if lxml_html is not None:
+        return LxmlParser()
+    return SoupParser()
+
+
+def default_parser() -> NewsParser:
+    """
+        the fastest installed DOM parser, the json state fast path (JsonStateParser) is opt-in
+    """
+    return default_dom_parser()
+
+
+class CrawlState:
+    """
+        newest seen news of every symbol, used by the incremental crawl mode to stop at already known news.
+        the state is saved as a json file when a path is given, otherwise it only lives in memory.
+    """
 
-    def _get_news_links(self, symbol: str, page_count: int) -> list:
+    def __init__(self, path: str = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._state: dict = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+
+    def is_known(self, symbol: str, link: dict) -> bool:
+        """
+            a link is known when it is older than the newest seen news, or is one of the newest seen news
         """
-        Retrieves a list of news article links and their publication timestamps for a given currency pair symbol over a specified number of pages.
+        last = self._state.get(symbol)
+        if last is None:
+            return False
+        return link['timestamp'] < last['timestamp'] or (
+                link['timestamp'] == last['timestamp'] and link['url'] in last['urls'])
+
+    def update(self, symbol: str, links: list):
+        if not links:
+            return
+        newest = max(link['timestamp'] for link in links)
+        urls = [link['url'] for link in links if link['timestamp'] == newest]
+        with self._lock:
+            last = self._state.get(symbol)
+            if last is not None and last['timestamp'] > newest:
+                return
+            if last is not None and last['timestamp'] == newest:
+                urls = sorted(set(urls) | set(last['urls']))
+            self._state[symbol] = {"timestamp": newest, "urls": urls}
+            self._save()
+
+    def _save(self):
+        if not self._path:
+            return
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self._path)
+
+
+class ResponseCache:
+    """
+        disk cache of fetched pages keyed by url, pages are stored zlib compressed in a sqlite database.
+
+        news list pages expire after `listing_ttl` seconds and news pages after `article_ttl` seconds, None means
+        they never expire. when the stored size goes over `max_bytes` the least recently used pages are evicted.
+    """
+
+    def __init__(self, path: str = "investing_cache.sqlite", listing_ttl: float = 300, article_ttl: float = None,
+                 max_bytes: int = 512 * 1024 * 1024):
+        self._ttls = {"listing": listing_ttl, "article": article_ttl}
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, body BLOB NOT NULL, "
+                                 "size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._connection.commit()
+        self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def get(self, url: str, kind: str = None):
+        """
+            :return: the cached html content, or None when the url is not cached or is expired
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT body, fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            body, fetched_at = row
+            ttl = self._ttls.get(kind, self._ttls["listing"])
+            now = time.time()
+            if ttl is not None and now - fetched_at > ttl:
+                return None
+            self._connection.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+            self._connection.commit()
+        return zlib.decompress(body).decode("utf-8")
 
-        This method navigates through multiple pages of the news section on Investing.com for the specified currency symbol. It collects links to news articles along with their publication timestamps by parsing the HTML content of each page.
+    def put(self, url: str, html_content: str, kind: str = None):
+        body = zlib.compress(html_content.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO pages (url, body, size, fetched_at, accessed_at) "
+                                     "VALUES (?, ?, ?, ?, ?)", (url, body, len(body), now, now))
+            self._size += len(body) - (row[0] if row else 0)
+            self._evict()
+            self._connection.commit()
 
-        Parameters:
-        - symbol (str): The currency pair symbol (e.g., 'gbp-usd') for which news links are to be retrieved.
-        - page_count (int): The number of pages to scrape from the website. Each page typically contains multiple news articles.
+    def _evict(self):
+        while self._size > self._max_bytes:
+            rows = self._connection.execute("SELECT url, size FROM pages ORDER BY accessed_at LIMIT 100").fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                self._connection.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._size -= size
+                if self._size <= self._max_bytes:
+                    break
 
-        Returns:
-        - list: A list of dictionaries where each dictionary contains 'url' and 'timestamp' keys for each news article found. The 'url' key holds the URL of the article, and 'timestamp' key holds the publication date and time in ISO format.
+    def close(self):
+        with self._lock:
+            self._connection.close()
 
-        Raises:
-        - Exception: If an error occurs during the scraping process, an exception is logged indicating which page the error occurred on, and the function attempts to continue with the next page.
 
-        Example Usage:
-        >> extractor = InvestingNewsExtractor()
-        >> news_links = extractor.get_news_links('eur-usd', 2)
-        >> print(news_links)
-        [{'url': 'https://www.investing.com/news/forex-news/article-12345', 'timestamp': '2024-05-01T12:00:00Z'}, ...]
+class RawArchive:
+    """
+        append-only archive of the raw html of fetched pages, so pages can be parsed again without crawling.
+
+        every page is compressed on its own (zstd when zstandard is installed, zlib otherwise) and appended to
+        segment files, a sqlite index keeps the segment, offset and length of every stored version of a url.
+        train_dictionary trains a zstd dictionary on the stored pages, small pages of the same site compress much
+        better with it. old dictionaries are kept, so pages compressed with them can still be read.
+    """
+
+    def __init__(self, directory: str = "investing_archive", segment_size: int = 256 * 1024 * 1024,
+                 level: int = 3):
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._segment_size = segment_size
+        self._level = level
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY, url TEXT NOT NULL, "
+                                 "kind TEXT, segment INTEGER NOT NULL, offset INTEGER NOT NULL, "
+                                 "length INTEGER NOT NULL, codec TEXT NOT NULL, fetched_at REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS pages_url_fetched_at ON pages (url, fetched_at)")
+        self._connection.commit()
+        self._segment = self._connection.execute("SELECT COALESCE(MAX(segment), 0) FROM pages").fetchone()[0]
+        self._dictionaries: dict = {}
+        self._dictionary_id = None
+        dictionary_ids = sorted(int(name.split("-")[1].split(".")[0]) for name in os.listdir(directory)
+                                if name.startswith("dictionary-"))
+        if dictionary_ids and zstandard is not None:
+            self._dictionary_id = dictionary_ids[-1]
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self._directory, f"segment-{segment:05d}.bin")
+
+    def _dictionary(self, dictionary_id: int):
+        if dictionary_id not in self._dictionaries:
+            with open(os.path.join(self._directory, f"dictionary-{dictionary_id}.zstd"), "rb") as f:
+                self._dictionaries[dictionary_id] = zstandard.ZstdCompressionDict(f.read())
+        return self._dictionaries[dictionary_id]
+
+    def _compress(self, data: bytes):
+        if zstandard is None:
+            return zlib.compress(data, 6), "zlib"
+        if self._dictionary_id is None:
+            return zstandard.ZstdCompressor(level=self._level).compress(data), "zstd"
+        compressor = zstandard.ZstdCompressor(level=self._level, dict_data=self._dictionary(self._dictionary_id))
+        return compressor.compress(data), f"zstd:{self._dictionary_id}"
+
+    def _decompress(self, data: bytes, codec: str) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise ImportError("zstandard is required to read zstd compressed pages, install it with: "
+                              "pip install zstandard")
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        dictionary = self._dictionary(int(codec.split(":")[1]))
+        return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(data)
+
+    def append(self, url: str, html_content: str, kind: str = None):
+        data, codec = self._compress(html_content.encode("utf-8"))
+        with self._lock:
+            path = self._segment_path(self._segment)
+            if os.path.exists(path) and os.path.getsize(path) + len(data) > self._segment_size:
+                self._segment += 1
+                path = self._segment_path(self._segment)
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            self._connection.execute("INSERT INTO pages (url, kind, segment, offset, length, codec, fetched_at) "
+                                     "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (url, kind, self._segment, offset, len(data), codec, time.time()))
+            self._connection.commit()
+
+    def _read(self, segment: int, offset: int, length: int, codec: str) -> str:
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return self._decompress(f.read(length), codec).decode("utf-8")
+
+    def get(self, url: str):
+        """
+            :return: html content of the latest stored version of the url, or None when it is not archived
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT segment, offset, length, codec FROM pages WHERE url = ? "
+                                           "ORDER BY fetched_at DESC LIMIT 1", (url,)).fetchone()
+        return self._read(*row) if row else None
+
+    def iter_pages(self, url_prefix: str = "", kind: str = None):
+        """
+            :return: a generator of (url, html_content) of every stored version whose url starts with url_prefix,
+                oldest first
         """
-        links: list = []
+        sql = "SELECT url, segment, offset, length, codec FROM pages WHERE substr(url, 1, ?) = ?"
+        parameters = [len(url_prefix), url_prefix]
+        if kind is not None:
+            sql += " AND kind = ?"
+            parameters.append(kind)
+        with self._lock:
+            rows = self._connection.execute(sql + " ORDER BY fetched_at", parameters).fetchall()
+        for url, segment, offset, length, codec in rows:
+            yield url, self._read(segment, offset, length, codec)
 
-        for i in range(1, page_count + 1):
+    def train_dictionary(self, sample_count: int = 2000, dictionary_size: int = 112640):
+        """
+            train a zstd dictionary on the latest stored pages, the pages that are appended after it use it
+        """
+        if zstandard is None:
+            raise ImportError("zstandard is required to train a dictionary, install it with: pip install zstandard")
+        with self._lock:
+            rows = self._connection.execute("SELECT segment, offset, length, codec FROM pages ORDER BY id DESC "
+                                            "LIMIT ?", (sample_count,)).fetchall()
+        samples = [self._read(*row).encode("utf-8") for row in rows]
+        dictionary = zstandard.train_dictionary(dictionary_size, samples)
+        dictionary_id = dictionary.dict_id()
+        with open(os.path.join(self._directory, f"dictionary-{dictionary_id}.zstd"), "wb") as f:
+            f.write(dictionary.as_bytes())
+        self._dictionaries[dictionary_id] = dictionary
+        self._dictionary_id = dictionary_id
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ArchiveFetcher(Fetcher):
+    """
+        fetch pages from a RawArchive instead of the network, used to parse archived pages again
+    """
+    rate_limited = False
+
+    def __init__(self, archive: RawArchive):
+        self.archive = archive
+
+    def fetch(self, url: str, kind: str = None) -> str:
+        html_content = self.archive.get(url)
+        if html_content is None:
+            raise FetchError(url, "page is not archived")
+        return html_content
+
+
+class SeenIndex:
+    """
+        persistent index of the news urls that are already fetched, so a news is not fetched again in later runs.
+        only a 64 bit hash of every url is stored in a sqlite table, which keeps the index compact.
+    """
+
+    def __init__(self, path: str = "investing_seen.sqlite"):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._connection.commit()
+
+    @staticmethod
+    def _key(url: str) -> int:
+        return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM seen WHERE key = ?", (self._key(url),)).fetchone() is not None
+
+    def add(self, url: str):
+        with self._lock:
+            self._connection.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (self._key(url),))
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class SQLiteNewsStore:
+    """
+        sqlite storage of the extracted news, it can be given to the extractor as a sink.
+
+        news are upserted by url in batched transactions. the symbols of a news are kept in a separate table that is
+        indexed on (symbol, timestamp), so the symbol queries stay fast with millions of stored news.
+    """
+
+    def __init__(self, path: str = "investing_news.sqlite"):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS news (url TEXT PRIMARY KEY, title TEXT, content TEXT, "
+                                 "timestamp INTEGER NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS news_symbols (symbol TEXT NOT NULL, url TEXT NOT NULL, "
+                                 "timestamp INTEGER NOT NULL, PRIMARY KEY (symbol, url)) WITHOUT ROWID")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS news_symbols_symbol_timestamp "
+                                 "ON news_symbols (symbol, timestamp)")
+        self._connection.commit()
+
+    def write(self, news_list: list):
+        """
+            upsert a batch of news dicts (as returned by main) in one transaction
+        """
+        if not news_list:
+            return
+        news_rows = [(news["url"], news["title"], news["content"], news["timestamp"]) for news in news_list]
+        symbol_rows = [(symbol, news["url"], news["timestamp"])
+                       for news in news_list for symbol in news.get("symbols") or [news["symbol"]]]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO news (url, title, content, timestamp) VALUES (?, ?, ?, ?) ON CONFLICT (url) DO UPDATE "
+                "SET title = excluded.title, content = excluded.content, timestamp = excluded.timestamp", news_rows)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO news_symbols (symbol, url, timestamp) VALUES (?, ?, ?)", symbol_rows)
+
+    def _query(self, sql: str, parameters: tuple) -> list:
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [{"symbol": symbol, "content": content, "url": url, "title": title, "timestamp": timestamp}
+                for symbol, content, url, title, timestamp in rows]
+
+    def latest(self, symbol: str, n: int = 10) -> list:
+        """
+            :return: the n newest news of the symbol, newest first
+        """
+        return self._query("SELECT s.symbol, n.content, n.url, n.title, s.timestamp FROM news_symbols s "
+                           "JOIN news n ON n.url = s.url WHERE s.symbol = ? ORDER BY s.timestamp DESC LIMIT ?",
+                           (symbol, n))
+
+    def range(self, symbol: str, t0: int, t1: int) -> list:
+        """
+            :param t0: start timestamp in milliseconds, inclusive
+            :param t1: end timestamp in milliseconds, exclusive
+            :return: the news of the symbol in [t0, t1), oldest first
+        """
+        return self._query("SELECT s.symbol, n.content, n.url, n.title, s.timestamp FROM news_symbols s "
+                           "JOIN news n ON n.url = s.url WHERE s.symbol = ? AND s.timestamp >= ? AND s.timestamp < ? "
+                           "ORDER BY s.timestamp", (symbol, t0, t1))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ParquetNewsExporter:
+    """
+        write news batches as parquet files partitioned by symbol and date, it can be given to the extractor as a sink.
+
+        files are written in hive layout (root/symbol=eur-usd/date=2024-05-01/part-*.parquet) so readers can prune
+        on symbol and date. every write appends new files, nothing is rewritten. needs pyarrow.
+    """
+
+    def __init__(self, root: str, compression: str = "zstd"):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for ParquetNewsExporter, install it with: pip install pyarrow")
+        self._root = root
+        self._compression = compression
+        self._schema = pyarrow.schema([
+            ("symbol", pyarrow.string()),
+            ("date", pyarrow.string()),
+            ("url", pyarrow.string()),
+            ("title", pyarrow.string()),
+            ("content", pyarrow.string()),
+            ("timestamp", pyarrow.timestamp("ms", tz="UTC")),
+        ])
+
+    def write(self, news_list: list):
+        """
+            append a batch of news dicts (as returned by main)
+        """
+        if not news_list:
+            return
+        rows = [{"symbol": news["symbol"],
+                 "date": datetime.datetime.fromtimestamp(news["timestamp"] / 1000,
+                                                         datetime.timezone.utc).strftime("%Y-%m-%d"),
+                 "url": news["url"], "title": news["title"], "content": news["content"],
+                 "timestamp": news["timestamp"]}
+                for news in news_list]
+        batch = pyarrow.RecordBatch.from_pylist(rows, schema=self._schema)
+        pyarrow.parquet.write_to_dataset(pyarrow.Table.from_batches([batch]), root_path=self._root,
+                                         partition_cols=["symbol", "date"], compression=self._compression,
+                                         basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet")
+
+
+class NewsStreamServer:
+    """
+        push every extracted news to local subscribers with Server-Sent Events, instead of polling a database.
+
+        clients connect to http://host:port/events, optionally filtered by symbol
+        (/events?symbol=eur-usd&symbol=gbp-usd or /events?symbol=eur-usd,gbp-usd), and get every news as a `news`
+        event with the news dict as json data. give it to the extractor as `stream` to publish every news as soon as
+        it is extracted, or as a sink to publish in batches. a subscriber that falls more than queue_size news behind
+        is disconnected. a news that is published again (e.g. for a symbol that listed it later) is only sent to the
+        subscribers that did not get it yet, for the last `dedupe_size` news urls.
+    """
+    _keepalive_interval: float = 15
+
+    def __init__(self, port: int = 8765, host: str = "127.0.0.1", queue_size: int = 1000,
+                 dedupe_size: int = 10000):
+        self._queue_size = queue_size
+        self._dedupe_size = dedupe_size
+        self._lock = threading.Lock()
+        # list of (symbols or None for all symbols, queue of the subscriber)
+        self._subscribers: list = []
+        # news url -> queues of the subscribers that got it, oldest url first
+        self._delivered: dict = {}
+        self._closed = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def address(self) -> tuple:
+        return self._server.server_address
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _subscribe(self, symbols) -> queue.Queue:
+        subscription = (symbols, queue.Queue(maxsize=self._queue_size))
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription[1]
+
+    def _unsubscribe(self, events: queue.Queue):
+        with self._lock:
+            self._subscribers = [subscription for subscription in self._subscribers if subscription[1] is not events]
+
+    def _handler_class(self):
+        stream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/events":
+                    self.send_error(404)
+                    return
+                symbols = {symbol for value in parse_qs(url.query).get("symbol", [])
+                           for symbol in value.split(",") if symbol} or None
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                events = stream._subscribe(symbols)
+                try:
+                    while not stream._closed.is_set():
+                        try:
+                            data = events.get(timeout=stream._keepalive_interval)
+                        except queue.Empty:
+                            # a comment line keeps the connection open and finds closed connections
+                            data = b": keepalive\n\n"
+                        if data is None:
+                            break
+                        self.wfile.write(data)
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    stream._unsubscribe(events)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def publish(self, news: dict, symbols: list = None):
+        """
+            send one news dict (as returned by main) to the subscribers of its symbols
+            :param symbols: symbols whose subscribers get the news, default is the symbols of the news
+        """
+        data = f"event: news\ndata: {json.dumps(news, ensure_ascii=False)}\n\n".encode("utf-8")
+        news_symbols = set(symbols or news.get("symbols") or [news.get("symbol")])
+        url = news.get("url")
+        with self._lock:
+            subscribers = list(self._subscribers)
+            delivered = self._delivered.pop(url, None) if url is not None else None
+            if delivered is None:
+                delivered = set()
+            if url is not None:
+                self._delivered[url] = delivered
+                while len(self._delivered) > self._dedupe_size:
+                    self._delivered.pop(next(iter(self._delivered)))
+        for symbols, events in subscribers:
+            if symbols is not None and not symbols & news_symbols:
+                continue
+            with self._lock:
+                if events in delivered:
+                    continue
+                delivered.add(events)
             try:
-                html_content = self._get_site_html_content(self._news_url.format(symbol=symbol, page_number=i))
-                news_links = self._extract_link_from_html(html_content)
+                events.put_nowait(data)
+            except queue.Full:
+                logging.warning("News stream subscriber is %s news behind, disconnecting it", self._queue_size)
+                self._unsubscribe(events)
+                self._disconnect(events)
 
-                for news_link in news_links:
-                    links.append(news_link)
+    @staticmethod
+    def _disconnect(events: queue.Queue):
+        # make room for the end of stream marker
+        while True:
+            try:
+                events.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    pass
 
+    def write(self, news_list: list):
+        for news in news_list:
+            self.publish(news)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for _, events in subscribers:
+            self._disconnect(events)
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class InvestingNewsExtractor:
+    _base_url: str = "https://www.investing.com"
+    # a page without its marker can not be parsed, so it is fetched again with the fallback fetcher
+    _page_markers: dict = {"listing": "article-item", "article": "articleTitle"}
+
+    def __init__(self, fetcher: Fetcher = None, fallback_fetcher: Fetcher = None, workers: int = 4,
+                 queue_size: int = 32, state_path: str = None, cache: ResponseCache = None,
+                 parser: NewsParser = None, seen_index: SeenIndex = None, sinks: list = None,
+                 sink_batch_size: int = 100, archive: RawArchive = None, base_url: str = None,
+                 metrics: MetricsSink = None, retry_policy: RetryPolicy = None, rate_limiter: RateLimiter = None,
+                 parse_executor: str = None, parse_workers: int = None, revalidate: bool = False,
+                 stream: NewsStreamServer = None):
+        """
+        :param fetcher: fetcher that is used for every page, default is HttpFetcher
+        :param fallback_fetcher: fetcher that is used when the page can not be fetched or lacks the needed markers,
+            default is ChromeFetcher when no fetcher is given
+        :param workers: number of threads that fetch news pages in main
+        :param queue_size: size of the bounded queues between the pipeline stages of main
+        :param state_path: json file that keeps the newest seen news of every symbol for incremental crawls,
+            by default the state only lives as long as the extractor
+        :param cache: cache that is checked before every page fetch, it is not closed with the extractor
+        :param parser: html parser backend, default is the fastest installed one (see default_parser)
+        :param seen_index: index of the news that are fetched by the previous runs, these news are skipped.
+            it is not closed with the extractor
+        :param sinks: objects with a write(news_list) method (e.g. SQLiteNewsStore), every extracted news is written
+            to them in batches of sink_batch_size. they are not closed with the extractor
+        :param archive: archive that keeps the raw html of every fetched page, it is not closed with the extractor.
+            to parse archived pages again without network use fetcher=ArchiveFetcher(archive) instead
+        :param base_url: site to scrape instead of https://www.investing.com, e.g. a local mirror
+        :param metrics: sink of the stage timings and counters, default is an in-process MetricsRegistry
+        :param retry_policy: retries of failed page fetches, default is RetryPolicy()
+        :param rate_limiter: limiter in front of every network fetch, default is RateLimiter() when no fetcher is
+            given. share one limiter between extractors that scrape at the same time
+        :param parse_executor: where the html is parsed: None parses on the fetch threads, 'thread' on a thread pool
+            and 'process' on a process pool, which scales parsing with the cores instead of sharing the GIL
+            (started with forkserver, or spawn where forkserver is not available). the pool is kept between runs,
+            call close() when the extractor is no longer needed
+        :param parse_workers: size of the parse pool, default is the number of cores
+        :param revalidate: skip news list pages whose news did not change since their last fetch, they are not parsed
+            and their news pages are not fetched. the default HttpFetcher also sends conditional requests
+        :param stream: server that every news is published to as soon as it is extracted, it is not closed with the
+            extractor
+        """
+        if parse_executor not in (None, "thread", "process"):
+            raise ValueError(f"parse_executor must be None, 'thread' or 'process', not {parse_executor!r}")
+        self._metrics: MetricsSink = metrics or MetricsRegistry()
+        if fetcher is None:
+            fetcher = HttpFetcher(conditional=revalidate)
+            fallback_fetcher = fallback_fetcher or ChromeFetcher(metrics=self._metrics,
+                                                                 profile=ChromeProfile.scraping())
+            rate_limiter = rate_limiter or RateLimiter()
+        self._rate_limiter: RateLimiter = rate_limiter
+        self._fetcher: Fetcher = fetcher
+        self._fallback_fetcher: Fetcher = fallback_fetcher
+        self._workers = workers
+        self._queue_size = queue_size
+        self._state = CrawlState(state_path)
+        self._cache: ResponseCache = cache
+        self._parser: NewsParser = parser or default_parser()
+        self._seen_index: SeenIndex = seen_index
+        self._sinks: list = sinks or []
+        self._sink_batch_size = sink_batch_size
+        self._archive: RawArchive = archive
+        self._retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self._failures: list = []
+        self._failures_lock = threading.Lock()
+        self._parse_executor_kind = parse_executor
+        self._parse_workers = parse_workers or os.cpu_count()
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+        self._revalidate = revalidate
+        self._stream: NewsStreamServer = stream
+        # url -> digest of the news list region of the last fetch of every news list page
+        # they are only saved when a run finishes without failures, see _save_listing_digests
+        self._listing_digests: dict = {}
+        # symbol -> deepest news list page that is saved in the digests
+        self._listing_depths: dict = {}
+        self._listing_digests_lock = threading.Lock()
+        if base_url is not None:
+            self._base_url = base_url.rstrip("/")
+        self._news_url = self._base_url + "/currencies/{symbol}-news/{page_number}/"
+
+    @property
+    def metrics(self) -> MetricsSink:
+        return self._metrics
+
+    @property
+    def failures(self) -> list:
+        """
+            the ExtractorError of every page that failed in the last run, these pages are missing from its result
+        """
+        with self._failures_lock:
+            return list(self._failures)
+
+    def _reset_failures(self):
+        with self._failures_lock:
+            self._failures = []
+
+    def _record_failure(self, error: ExtractorError):
+        logging.error("%s: %s", type(error).__name__, error)
+        self._metrics.increment("failures", type=type(error).__name__)
+        with self._failures_lock:
+            self._failures.append(error)
+
+    def _parse(self, method: str, html_content: str):
+        """
+            run a method of the parser on the html, on the parse pool when there is one. with a process pool only the
+            html and the small extracted result cross the process boundary
+        """
+        if self._parse_executor_kind is None:
+            return getattr(self._parser, method)(html_content)
+        return self._start_parse_pool().submit(getattr(self._parser, method), html_content).result()
+
+    def _start_parse_pool(self):
+        """
+            create the parse pool if it does not exist yet. it is called before the fetch threads start, and the pool
+            lives until close() so every run does not pay the process startup again
+            :return: the parse pool, None when parsing runs on the fetch threads
+        """
+        if self._parse_executor_kind is None:
+            return None
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                if self._parse_executor_kind == "process":
+                    # forking a process that runs fetch threads can deadlock the child, so fork from a clean server
+                    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    self._parse_pool = ProcessPoolExecutor(max_workers=self._parse_workers,
+                                                           mp_context=multiprocessing.get_context(start_method))
+                else:
+                    self._parse_pool = ThreadPoolExecutor(max_workers=self._parse_workers)
+            return self._parse_pool
+
+    def _has_page_markers(self, html_content: str, kind: str = None) -> bool:
+        marker = self._page_markers.get(kind)
+        return marker is None or marker in html_content
+
+    def _listing_digest(self, html_content: str):
+        """
+            hash of the news list region of a news list page, from the first news item to the last </article>.
+            the rest of the page (quotes, ads, scripts) changes on every fetch, so it is left out
+        """
+        start = html_content.find(self._page_markers["listing"])
+        end = html_content.rfind("</article>")
+        if start == -1 or end < start:
+            return None
+        return hashlib.blake2b(html_content[start:end].encode("utf-8"), digest_size=16).digest()
+
+    def _save_listing_digests(self, digests: dict):
+        """
+            save the digests of the news list pages of a run, only when all their news are handled. a run that
+            stopped early or had failures keeps the old digests, so its pages are parsed again next time
+            :param digests: url -> (symbol, page_number, digest) of the parsed news list pages of the run
+        """
+        with self._listing_digests_lock:
+            for url, (symbol, page_number, digest) in digests.items():
+                self._listing_digests[url] = digest
+                self._listing_depths[symbol] = max(self._listing_depths.get(symbol, 0), page_number)
+
+    def _is_throttled_page(self, html_content: str, kind: str = None) -> bool:
+        # captcha and bot check pages come back with a 200 status, but without the page markers
+        if self._has_page_markers(html_content, kind):
+            return False
+        html_content = html_content.lower()
+        return "captcha" in html_content or "challenge-platform" in html_content
+
+    def _fetch_with(self, fetcher: Fetcher, url, kind: str = None) -> str:
+        fetcher_name = type(fetcher).__name__
+        rate_limiter = self._rate_limiter if fetcher.rate_limited else None
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
+        start = time.perf_counter()
+        try:
+            with self._metrics.timer("fetch", kind=kind, fetcher=fetcher_name):
+                html_content = fetcher.fetch(url, kind)
+        except Exception as e:
+            self._metrics.increment("fetch_errors", kind=kind, fetcher=fetcher_name)
+            if rate_limiter is not None:
+                if isinstance(e, HttpStatusError):
+                    rate_limiter.record(url, time.perf_counter() - start,
+                                        throttled=e.status in (429, 403) or e.status >= 500)
+                else:
+                    rate_limiter.record(url, time.perf_counter() - start, failed=True)
+            raise
+        self._metrics.increment("pages_fetched", kind=kind, fetcher=fetcher_name)
+        if rate_limiter is not None:
+            throttled = self._is_throttled_page(html_content, kind)
+            if throttled:
+                self._metrics.increment("throttled_pages", kind=kind, fetcher=fetcher_name)
+            rate_limiter.record(url, time.perf_counter() - start, throttled=throttled)
+        return html_content
+
+    def _fetch_html_content(self, url, kind: str = None) -> str:
+        try:
+            html_content = self._fetch_with(self._fetcher, url, kind)
+            if self._fallback_fetcher is None or self._has_page_markers(html_content, kind):
+                return html_content
+            logging.info("Page markers not found, falling back to %s: %s", type(self._fallback_fetcher).__name__, url)
+        except Exception as e:
+            # retryable errors (e.g. 429 or 503 with Retry-After) go to the retry loop and its backoff, a fallback
+            # fetch right away would hit the throttled host again
+            if self._fallback_fetcher is None or self._retry_policy.should_retry(e):
+                raise
+            logging.warning("Fetch failed (%s), falling back to %s: %s", e, type(self._fallback_fetcher).__name__, url)
+
+        self._metrics.increment("fallbacks", kind=kind)
+        return self._fetch_with(self._fallback_fetcher, url, kind)
+
+    def _get_site_html_content(self, url, kind: str = None) -> str:
+        if self._cache is not None:
+            html_content = self._cache.get(url, kind)
+            if html_content is not None:
+                self._metrics.increment("cache_hits", kind=kind)
+                return html_content
+            self._metrics.increment("cache_misses", kind=kind)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                html_content = self._fetch_html_content(url, kind)
+                break
             except Exception as e:
-                print(f"An error occurred while scraping page {i}: {e}")
-                logging.error(f"an error occurred while scraping page {i}: {e}")
+                if attempt >= self._retry_policy.max_attempts or not self._retry_policy.should_retry(e):
+                    if isinstance(e, FetchError):
+                        e.attempts = attempt
+                        raise
+                    raise FetchError(url, f"{type(e).__name__}: {e}", attempt) from e
+                delay = self._retry_policy.delay(attempt, e)
+                logging.warning("Fetch attempt %s failed (%s), retrying in %.1fs: %s", attempt, e, delay, url)
+                self._metrics.increment("retries", kind=kind)
+                time.sleep(delay)
+
+        if self._archive is not None:
+            self._archive.append(url, html_content, kind)
+        # pages without markers are error or captcha pages, they should be fetched again next time
+        if self._cache is not None and self._has_page_markers(html_content, kind):
+            self._cache.put(url, html_content, kind)
+        return html_content
 
-        return links
+    def _extract_link_from_html(self, html_content: str, url: str = None) -> list:
+        """
+            this function get a html page and extract all the news link
+            :param html_content: html content of the news lists page
+            :param url: url of the page, only used in the error
+            :return: a list of news links
+            :raise ParseError: if the page can not be parsed
+        """
+
+        try:
+            with self._metrics.timer("parse_listing"):
+                return self._parse("extract_links", html_content)
+        except Exception as e:
+            raise ParseError(url, f"could not parse the news list page ({e})") from e
+
+    def _get_news_links_page(self, symbol: str, page_number: int, digests: dict = None) -> list:
+        """
+            fetch one news list page of the symbol and extract its news links
+            :param digests: the digest of the page is added to it when revalidate is on, see _save_listing_digests
+            :return: a list of {'url', 'timestamp'} dicts
+            :raise ParseError: if the page has no news list
+            :raise PageUnchanged: if revalidate is on and the news of the page did not change since its last fetch
+        """
+        url = self._news_url.format(symbol=symbol, page_number=page_number)
+        html_content = self._get_site_html_content(url, kind="listing")
+        if not self._has_page_markers(html_content, "listing"):
+            # e.g. a captcha page when there is no fallback fetcher, it must not look like a page without news
+            raise ParseError(url, "news list not found")
+        digest = self._listing_digest(html_content) if self._revalidate else None
+        if digest is not None:
+            with self._listing_digests_lock:
+                unchanged = self._listing_digests.get(url) == digest
+            if unchanged:
+                self._metrics.increment("unchanged_pages", kind="listing")
+                raise PageUnchanged(url)
+        news_links = self._extract_link_from_html(html_content, url)
+        if digest is not None and digests is not None:
+            digests[url] = (symbol, page_number, digest)
+        return news_links
+
+    def _is_crawled_through(self, symbol: str, page_count: int) -> bool:
+        """
+            an unchanged news list page only ends the crawl when the previous runs parsed the next pages too,
+            e.g. a run with a smaller page_count or an incremental run that stopped early did not
+        """
+        with self._listing_digests_lock:
+            return self._listing_depths.get(symbol, 0) >= page_count
 
     def _extract_content_from_news_link(self, url: str) -> dict:
         """
@@ -108,58 +1843,570 @@ class InvestingNewsExtractor:
 
         :param url: The URL of the news article to extract content from.
         :return: The extracted news content as a string, or None if the content cannot be found.
+        :raise FetchError: if the page can not be fetched
+        :raise ParseError: if the page can not be parsed
         """
+        # Fetch the HTML content of the provided URL.
+        html_content = self._get_site_html_content(self._base_url + url, kind="article")
+
         try:
-            # Fetch the HTML content of the provided URL.
-            html_content = self._get_site_html_content(self._base_url + url)
+            with self._metrics.timer("parse_article"):
+                return self._parse("extract_content", html_content)
+        except Exception as e:
+            raise ParseError(url, f"could not parse the news page ({e})") from e
 
-            # Create a BeautifulSoup object to parse the HTML.
-            soup = BeautifulSoup(html_content, 'html.parser')
+    def _write_to_sinks(self, news_list: list):
+        if not news_list:
+            return
+        for sink in self._sinks:
+            sink.write(news_list)
 
-            # Find the <div> element with the class "articlePage" that typically contains the news content.
-            img_carousel_div = soup.find('div', id='article')
+    def _is_new_link(self, news_link: dict, seen_urls: set) -> bool:
+        """
+            check a link against the urls of this run and the seen index before its news page is fetched
+            :param seen_urls: urls that are already queued in this run, the url of a new link is added to it
+        """
+        url = news_link['url']
+        if url in seen_urls:
+            return False
+        seen_urls.add(url)
+        return self._seen_index is None or url not in self._seen_index
 
-            # Check if the element is found.
-            if img_carousel_div:
-                # Find all the <p> tags within the div to extract the text content.
-                p_tags = img_carousel_div.find_all('p')
+    def _get_news_item(self, link: dict, symbol: str, publish: bool = True) -> dict:
+        """
+            fetch the content of one news link and build the final news dict
+            :param link: a {'url', 'timestamp'} dict from the news list page
+            :param publish: publish the news to the stream, callers that know more symbols of the news publish it
+        """
+        news_content = self._extract_content_from_news_link(link['url'])
+        if news_content is None:
+            raise ParseError(link['url'], "news content not found")
 
-                # Extract the text content from the <p> tags and store it in a list.
-                p_texts = [p.get_text() for p in p_tags]
+        with self._metrics.timer("enrich"):
+            news_timestamp = datetime.datetime.strptime(link['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
+            news_timestamp = int(news_timestamp * 1000)
 
-                # Combine the extracted text content into a single string.
-                text = ""
-                for t in p_texts:
-                    text += t
-                    text += "\n"
+            news = {"symbol": symbol, "content": news_content["content"], "url": link['url'],
+                    "title": news_content["title"], "timestamp": news_timestamp}
+        if self._seen_index is not None:
+            self._seen_index.add(link['url'])
+        self._metrics.increment("news_extracted", symbol=symbol)
+        if publish and self._stream is not None:
+            self._stream.publish(news)
+        return news
 
-                return {"content": text, "title": soup.find("h1", id='articleTitle').text}
-            else:
-                return None
-        except Exception as e:
-            logging.error(f"{e}")
-            print(f'an unexpected error occurred: {e}')
+    def _try_get_news_item(self, link: dict, symbol: str, publish: bool = True):
+        """
+            same as _get_news_item, but a failed news is recorded in failures and None is returned
+        """
+        try:
+            return self._get_news_item(link, symbol, publish)
+        except ExtractorError as e:
+            self._record_failure(e)
+            return None
 
-    def _get_all_news_content(self, links: list, symbol: str) -> list:
-        news_information = []
-        for i in links:
-            news_content = self._extract_content_from_news_link(i['url'])
+    def _quit(self):
+        self._fetcher.close()
+        if self._fallback_fetcher is not None:
+            self._fallback_fetcher.close()
 
-            news_timestamp = datetime.datetime.strptime(i['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
-            news_timestamp = int(news_timestamp * 1000)
+    def close(self):
+        """
+            shut down the parse pool, the extractor can still be used afterwards and starts a new pool when needed
+        """
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+        # a blocking put that gives up when the pipeline is stopped
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _iter_pipeline(self, symbol: str, page_count: int, incremental: bool = False):
+        """
+        Producer/consumer pipeline of main.
+
+        One producer thread walks the news list pages and puts every extracted link on a bounded queue right away,
+        `workers` threads take the links and fetch the news pages. The bounded queues give backpressure, the
+        producer waits when the workers fall behind and the workers wait when the consumer falls behind.
+
+        In incremental mode links that are already known from the crawl state are skipped, and the producer stops
+        at the first news list page that reaches known news. The state is only updated when the whole crawl
+        succeeds, so a failed crawl is fetched again on the next run.
+
+        :return: a generator of ((page_number, index_in_page), news) in completion order. failed pages are
+            recorded in failures and skipped, any other exception is re-raised by the generator.
+        """
+        self._reset_failures()
+        self._start_parse_pool()
+        link_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        result_queue: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        stop = threading.Event()
+        done = object()
+        new_links: list = []
+        failed_pages: list = []
+        seen_urls: set = set()
+        digests: dict = {}
+
+        def produce():
+            try:
+                for i in range(1, page_count + 1):
+                    if stop.is_set():
+                        break
+                    try:
+                        news_links = self._get_news_links_page(symbol, i, digests)
+                    except PageUnchanged:
+                        if not self._is_crawled_through(symbol, page_count):
+                            continue
+                        # the next pages only have older news, which were handled when this page last changed
+                        logging.info("News list page %s of %s is unchanged, stopping", i, symbol)
+                        break
+                    except ExtractorError as e:
+                        self._record_failure(e)
+                        failed_pages.append(i)
+                        continue
+                    except Exception as e:
+                        logging.error(f"an error occurred while scraping page {i}: {e}")
+                        failed_pages.append(i)
+                        continue
+                    reached_known = False
+                    for j, news_link in enumerate(news_links):
+                        if incremental and self._state.is_known(symbol, news_link):
+                            reached_known = True
+                            continue
+                        new_links.append(news_link)
+                        if not self._is_new_link(news_link, seen_urls):
+                            continue
+                        if not self._put(link_queue, ((i, j), news_link), stop):
+                            return
+                    if reached_known:
+                        logging.info("Reached known news of %s on page %s, stopping", symbol, i)
+                        break
+            except Exception as e:
+                # the generator re-raises it
+                self._put(result_queue, (None, e), stop)
+            finally:
+                # without the done markers the workers and the generator would wait forever
+                for _ in range(self._workers):
+                    self._put(link_queue, done, stop)
+
+        def consume():
+            while not stop.is_set():
+                try:
+                    item = link_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is done:
+                    break
+                position, news_link = item
+                try:
+                    result = self._try_get_news_item(news_link, symbol)
+                except Exception as e:
+                    result = e
+                if result is None:
+                    continue
+                if not self._put(result_queue, (position, result), stop):
+                    return
+            self._put(result_queue, done, stop)
+
+        threads = [threading.Thread(target=produce, daemon=True)]
+        threads += [threading.Thread(target=consume, daemon=True) for _ in range(self._workers)]
+        for thread in threads:
+            thread.start()
+
+        batch: list = []
+        try:
+            running = self._workers
+            while running:
+                item = result_queue.get()
+                if item is done:
+                    running -= 1
+                    continue
+                position, result = item
+                if isinstance(result, Exception):
+                    raise result
+                batch.append(result)
+                if len(batch) >= self._sink_batch_size:
+                    self._write_to_sinks(batch)
+                    batch = []
+                yield position, result
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self._write_to_sinks(batch)
+
+        if not failed_pages and not self.failures:
+            if incremental:
+                self._state.update(symbol, new_links)
+            self._save_listing_digests(digests)
+
+    def main(self, symbol: str, page_count: int = 1, incremental: bool = False) -> list:
+        """
+        :param symbol: the currency pair symbol (e.g., 'eur-usd')
+        :param page_count: maximum number of news list pages to scrape
+        :param incremental: only fetch news that are newer than the newest news seen by the previous runs
+        :return: a list of news dicts in the order of the news list pages
+        """
+        try:
+            results = sorted(self._iter_pipeline(symbol, page_count, incremental), key=lambda item: item[0])
+        finally:
+            self._quit()
+        return [news for _, news in results]
+
+    def main_many(self, symbols: list, page_count: int = 1) -> dict:
+        """
+        Scrape many symbols with the same fetchers and worker threads.
+
+        Every symbol starts with its first news list page and queues its next page when the previous one is done,
+        so the symbols are interleaved fairly on the `workers` threads. A news that is listed under many symbols is
+        fetched only once.
+
+        :param symbols: currency pair symbols (e.g., ['eur-usd', 'gbp-usd'])
+        :param page_count: number of news list pages to scrape for every symbol
+        :return: a dict of symbol to the list of its news dicts, like main returns. every news dict also has a
+            'symbols' key with all the symbols the news is listed under.
+        """
+        links_by_symbol: dict = {symbol: [] for symbol in symbols}
+        symbols_by_url: dict = {}
+        news_futures: dict = {}
+        # url -> symbols whose stream subscribers already got the news
+        published: dict = {}
+        pending: dict = {}
+        digests: dict = {}
+        failed_pages: list = []
+        self._start_parse_pool()
+        executor = ThreadPoolExecutor(max_workers=self._workers)
+        self._reset_failures()
+
+        def publish(url: str):
+            # the news is published when it is extracted, a symbol that lists it later gets it then
+            news_future = news_futures[url]
+            if self._stream is None or not news_future.done() or news_future.result() is None:
+                return
+            url_published = published.setdefault(url, [])
+            targets = [s for s in symbols_by_url[url] if s not in url_published]
+            if not targets:
+                return
+            news = dict(news_future.result())
+            news["symbols"] = [s for s in symbols if s in symbols_by_url[url]]
+            self._stream.publish(news, symbols=targets)
+            url_published.extend(targets)
+
+        try:
+            for symbol in symbols:
+                pending[executor.submit(self._get_news_links_page, symbol, 1, digests)] = (symbol, 1, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol, page_number, url = pending.pop(future)
+                    if page_number is None:
+                        publish(url)
+                        continue
+
+                    # the page is done, so its result decides whether the next page is queued
+                    news_links = []
+                    try:
+                        news_links = future.result()
+                    except PageUnchanged:
+                        if self._is_crawled_through(symbol, page_count):
+                            continue
+                    except ExtractorError as e:
+                        self._record_failure(e)
+                    except Exception as e:
+                        logging.error(f"an error occurred while scraping page {page_number} of {symbol}: {e}")
+                        failed_pages.append((symbol, page_number))
+                    if page_number < page_count:
+                        pending[executor.submit(self._get_news_links_page, symbol, page_number + 1, digests)] = (
+                            symbol, page_number + 1, None)
+
+                    for j, news_link in enumerate(news_links):
+                        url = news_link['url']
+                        if url not in symbols_by_url and self._seen_index is not None and url in self._seen_index:
+                            continue
+                        links_by_symbol[symbol].append(((page_number, j), news_link))
+                        url_symbols = symbols_by_url.setdefault(url, [])
+                        if symbol not in url_symbols:
+                            url_symbols.append(symbol)
+                        if url not in news_futures:
+                            news_future = executor.submit(self._try_get_news_item, news_link, symbol, False)
+                            news_futures[url] = news_future
+                            pending[news_future] = (symbol, None, url)
+                        else:
+                            publish(url)
+
+            results: dict = {}
+            for symbol in symbols:
+                results[symbol] = []
+                seen_urls = set()
+                for _, news_link in sorted(links_by_symbol[symbol], key=lambda item: item[0]):
+                    url = news_link['url']
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    news = news_futures[url].result()
+                    if news is None:
+                        continue
+                    news = dict(news)
+                    news["symbol"] = symbol
+                    news["symbols"] = [s for s in symbols if s in symbols_by_url[url]]
+                    results[symbol].append(news)
+
+            all_news = [news for symbol in symbols for news in results[symbol]]
+            for i in range(0, len(all_news), self._sink_batch_size):
+                self._write_to_sinks(all_news[i:i + self._sink_batch_size])
+            if not failed_pages and not self.failures:
+                self._save_listing_digests(digests)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._quit()
 
-            news_information.append(
-                {"symbol": symbol, "content": news_content["content"], "url": i['url'], "title": news_content["title"],
-                 "timestamp": news_timestamp})
+        return results
 
+    def replay(self, symbol: str) -> list:
+        """
+        Parse again every archived news list page of the symbol and their archived news pages, without network.
+
+        Unlike main, which only replays the latest version of the first page_count news list pages, every version
+        of every archived news list page is used. News that are not archived are skipped.
+
+        :return: a list of news dicts like main returns, newest first
+        """
+        if not isinstance(self._fetcher, ArchiveFetcher):
+            raise ValueError("replay needs an extractor that is created with fetcher=ArchiveFetcher(archive)")
+
+        self._reset_failures()
+        links: dict = {}
+        url_prefix = self._news_url.split("{page_number}")[0].format(symbol=symbol)
+        for url, html_content in self._fetcher.archive.iter_pages(url_prefix, kind="listing"):
+            try:
+                news_links = self._extract_link_from_html(html_content, url)
+            except ParseError as e:
+                self._record_failure(e)
+                continue
+            for news_link in news_links:
+                links[news_link['url']] = news_link
+
+        news_information = []
+        for news_link in sorted(links.values(), key=lambda link: link['timestamp'], reverse=True):
+            if self._fetcher.archive.get(self._base_url + news_link['url']) is None:
+                continue
+            news = self._try_get_news_item(news_link, symbol)
+            if news is not None:
+                news_information.append(news)
         return news_information
 
-    def _quit(self):
-        self._driver.quit()
-
-    def main(self, symbol: str, page_count: int = 1) -> list:
-        self._setup_chrome()
-        links = self._get_news_links(symbol, page_count)
-        data = self._get_all_news_content(links, symbol)
-        self._quit()
-        return data
+    def iter_news(self, symbol: str, page_count: int = 1, incremental: bool = False):
+        """
+        Streaming version of main, every news dict is yielded as soon as it is extracted.
+
+        Nothing is collected in memory, so downstream consumers can write the news to storage incrementally.
+        News are yielded in completion order, not in the order of the news list pages.
+
+        :param symbol: the currency pair symbol (e.g., 'eur-usd')
+        :param page_count: maximum number of news list pages to scrape
+        :param incremental: only fetch news that are newer than the newest news seen by the previous runs
+        :return: a generator of the same news dicts that main returns
+        """
+        pipeline = self._iter_pipeline(symbol, page_count, incremental)
+        try:
+            for _, news in pipeline:
+                yield news
+        finally:
+            pipeline.close()
+            self._quit()
+
+    def watch(self, symbols: list, min_interval: float = 30, max_interval: float = 900, smoothing: float = 0.3,
+              stop: threading.Event = None, max_polls: int = None):
+        """
+        Long-running watch of the first news list page of every symbol, only new news are yielded.
+
+        Every poll is an incremental crawl of page 1. The arrival rate of new news of every symbol is smoothed with
+        an exponentially weighted moving average, and the symbol is polled again when about one new news is
+        expected: busy symbols are polled every min_interval seconds, quiet symbols slow down to max_interval, at
+        most doubling their interval on every poll.
+        A symbol that failed is polled again after twice its interval. Combine with revalidate=True so unchanged
+        pages are not parsed. On the first poll of a symbol without crawl state, the news already on page 1 are
+        yielded too.
+
+        :param symbols: currency pair symbols (e.g., ['eur-usd', 'gbp-usd'])
+        :param min_interval: shortest time between two polls of a symbol, in seconds
+        :param max_interval: longest time between two polls of a symbol, in seconds
+        :param smoothing: weight of the last poll in the arrival rate average, between 0 and 1
+        :param stop: event that ends the watch, it is checked between polls
+        :param max_polls: end the watch after this many polls of all the symbols together
+        :return: a generator of the news dicts that main returns, in poll order
+        """
+        stop = stop or threading.Event()
+        # arrival rate in news per second and time of the last poll of every symbol
+        rates: dict = {symbol: None for symbol in symbols}
+        last_polls: dict = {}
+        intervals: dict = {symbol: min_interval for symbol in symbols}
+        # a poll with failures does not advance the crawl state, so its news come again on the next poll.
+        # the urls that are already yielded are kept until a poll of the symbol succeeds
+        emitted: dict = {symbol: set() for symbol in symbols}
+        schedule = [(time.monotonic(), i, symbol) for i, symbol in enumerate(symbols)]
+        heapq.heapify(schedule)
+        polls = 0
+        try:
+            while schedule and not stop.is_set() and (max_polls is None or polls < max_polls):
+                due, i, symbol = heapq.heappop(schedule)
+                if stop.wait(max(0.0, due - time.monotonic())):
+                    break
+
+                now = time.monotonic()
+                news_list = [news for _, news in sorted(self._iter_pipeline(symbol, 1, incremental=True),
+                                                        key=lambda item: item[0])
+                             if news["url"] not in emitted[symbol]]
+                polls += 1
+                self._metrics.increment("watch_polls", symbol=symbol)
+
+                if self.failures:
+                    emitted[symbol].update(news["url"] for news in news_list)
+                    interval = min(max_interval, intervals[symbol] * 2)
+                else:
+                    emitted[symbol].clear()
+                    if symbol in last_polls:
+                        observed = len(news_list) / max(now - last_polls[symbol], 1e-9)
+                        rate = rates[symbol]
+                        rates[symbol] = observed if rate is None else smoothing * observed + (1 - smoothing) * rate
+                    last_polls[symbol] = now
+                    rate = rates[symbol]
+                    if rate is None:
+                        interval = min_interval
+                    else:
+                        # an empty poll doubles the interval at most, so one quiet poll does not jump to max_interval
+                        interval = min(max_interval, intervals[symbol] * 2,
+                                       max(min_interval, 1 / rate if rate > 0 else max_interval))
+                intervals[symbol] = interval
+                logging.info("Watch of %s found %s new news, next poll in %.0fs", symbol, len(news_list), interval)
+                heapq.heappush(schedule, (now + interval, i, symbol))
+
+                for news in news_list:
+                    yield news
+        finally:
+            self._quit()
+
+    async def _aiter_crawl(self, symbol: str, page_count: int, concurrency: int):
+        """
+            async engine of amain and aiter_news
+            :return: an async generator of ((page_number, index_in_page), news) in completion order
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        self._start_parse_pool()
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        done = object()
+        seen_urls: set = set()
+        digests: dict = {}
+        failed_pages: list = []
+        self._reset_failures()
+
+        async def run(func, *args):
+            async with semaphore:
+                return await loop.run_in_executor(executor, func, *args)
+
+        async def crawl_news(position: tuple, link: dict):
+            try:
+                result = await run(self._try_get_news_item, link, symbol)
+            except Exception as e:
+                result = e
+            if result is not None:
+                await results.put((position, result))
+
+        async def crawl_page(page_number: int):
+            try:
+                links = await run(self._get_news_links_page, symbol, page_number, digests)
+            except PageUnchanged:
+                return
+            except ExtractorError as e:
+                self._record_failure(e)
+                return
+            except Exception as e:
+                logging.error(f"an error occurred while scraping page {page_number}: {e}")
+                failed_pages.append(page_number)
+                return
+            await asyncio.gather(*(crawl_news((page_number, j), link) for j, link in enumerate(links)
+                                   if self._is_new_link(link, seen_urls)))
+
+        async def crawl():
+            try:
+                await asyncio.gather(*(crawl_page(i) for i in range(1, page_count + 1)))
+            except Exception as e:
+                await results.put((None, e))
+            await results.put(done)
+
+        task = asyncio.create_task(crawl())
+        batch: list = []
+        try:
+            while True:
+                item = await results.get()
+                if item is done:
+                    break
+                position, result = item
+                if isinstance(result, Exception):
+                    raise result
+                batch.append(result)
+                if len(batch) >= self._sink_batch_size:
+                    await asyncio.to_thread(self._write_to_sinks, batch)
+                    batch = []
+                yield position, result
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+            await asyncio.to_thread(self._write_to_sinks, batch)
+
+        if not failed_pages and not self.failures:
+            self._save_listing_digests(digests)
+
+    async def amain(self, symbol: str, page_count: int = 1, concurrency: int = 8) -> list:
+        """
+        Async version of main, news list pages and news pages are fetched concurrently.
+
+        Every news list page starts fetching its news as soon as its links are extracted, at most `concurrency`
+        pages are fetched at the same time. The fetchers are blocking, so they run on a thread pool.
+
+        :param symbol: the currency pair symbol (e.g., 'eur-usd')
+        :param page_count: number of news list pages to scrape
+        :param concurrency: maximum number of pages that are fetched at the same time
+        :return: same list of news dicts as main, in the same order
+        """
+        crawl = self._aiter_crawl(symbol, page_count, concurrency)
+        try:
+            results = [item async for item in crawl]
+        finally:
+            await crawl.aclose()
+            self._quit()
+
+        return [news for _, news in sorted(results, key=lambda item: item[0])]
+
+    async def aiter_news(self, symbol: str, page_count: int = 1, concurrency: int = 8):
+        """
+        Async streaming version of main, every news dict is yielded as soon as it is extracted.
+
+        :param symbol: the currency pair symbol (e.g., 'eur-usd')
+        :param page_count: number of news list pages to scrape
+        :param concurrency: maximum number of pages that are fetched at the same time
+        :return: an async generator of the same news dicts that main returns, in completion order
+        """
+        crawl = self._aiter_crawl(symbol, page_count, concurrency)
+        try:
+            async for _, news in crawl:
+                yield news
+        finally:
+            await crawl.aclose()
+            self._quit()